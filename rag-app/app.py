@@ -1,8 +1,9 @@
 import streamlit as st
 import os
-from document_loader import extract_text_from_files, chunk_text
+from document_loader import extract_text_from_files, chunk_text, parse_cache
 from embeddings import get_embeddings, generate_response
 from chroma_client import get_chroma_client, get_or_create_collection, store_chunks_and_embeddings, reset_collection
+from retry_queue import pending_count, process_retry_queue, clear_retry_queue
 
 # Configure page
 st.set_page_config(
@@ -173,6 +174,9 @@ with col1:
                 # Extract text
                 combined_text = extract_text_from_files(uploaded_files)
                 st.success(f"✓ Extracted {len(combined_text):,} characters")
+                cache_stats = parse_cache.get_stats()
+                st.caption(f"Parse cache: {cache_stats['hits']} hit(s), {cache_stats['misses']} miss(es), "
+                           f"{cache_stats['hit_rate']:.0%} hit rate")
                 
                 # Chunk text
                 chunks = chunk_text(combined_text)
@@ -181,7 +185,10 @@ with col1:
                 # Generate embeddings
                 with st.spinner('🔄 Generating embeddings...'):
                     embeddings = get_embeddings(chunks)
-                st.success(f"✓ Generated {len(embeddings)} embeddings")
+                failed_count = sum(1 for emb in embeddings if emb is None)
+                st.success(f"✓ Generated {len(embeddings) - failed_count} embeddings")
+                if failed_count:
+                    st.warning(f"⚠️ {failed_count} chunk(s) failed to embed and were queued for retry")
                 
                 # Store in ChromaDB
                 try:
@@ -193,8 +200,11 @@ with col1:
                     time.sleep(1)
                     
                     collection_count = collection.count()
-                    st.success(f'✅ Documents stored successfully! Total documents: {collection_count}')
-                    st.balloons()
+                    if embeddings and failed_count == len(embeddings):
+                        st.error(f'❌ No chunks could be embedded, so nothing was stored. All {failed_count} chunk(s) are queued for retry.')
+                    else:
+                        st.success(f'✅ Documents stored successfully! Total documents: {collection_count}')
+                        st.balloons()
                     
                 except Exception as e:
                     error_msg = str(e)
@@ -203,6 +213,8 @@ with col1:
                         try:
                             reset_collection(client)
                             collection = get_or_create_collection(client)
+                            # Queued chunks belong to the old corpus; drop them with it
+                            clear_retry_queue(collection.name)
                             file_names = ", ".join([f.name for f in uploaded_files])
                             store_chunks_and_embeddings(collection, chunks, embeddings, file_names)
                             
@@ -210,7 +222,10 @@ with col1:
                             time.sleep(1)
                             
                             collection_count = collection.count()
-                            st.success(f'✅ Documents stored after reset! Total: {collection_count}')
+                            if embeddings and failed_count == len(embeddings):
+                                st.error(f'❌ No chunks could be embedded, so nothing was stored. All {failed_count} chunk(s) are queued for retry.')
+                            else:
+                                st.success(f'✅ Documents stored after reset! Total: {collection_count}')
                         except Exception as retry_error:
                             st.error(f'❌ Error: {retry_error}')
                     else:
@@ -250,10 +265,29 @@ with col2:
         else:
             st.markdown('<div class="info-box">ℹ️ Upload documents to get started</div>', unsafe_allow_html=True)
         
+        # Result of the last retry run (stored in session state to survive the rerun)
+        if 'retry_result' in st.session_state:
+            st.success(st.session_state.pop('retry_result'))
+        
+        # Chunks waiting to be re-embedded
+        queued_count = pending_count(collection.name)
+        if queued_count > 0:
+            st.markdown(f'<div class="info-box">⏳ {queued_count} chunk(s) waiting to be re-embedded</div>', unsafe_allow_html=True)
+            if st.button('🔁 Retry Failed Chunks', key='retry_queue'):
+                with st.spinner('🔄 Re-embedding queued chunks...'):
+                    try:
+                        stored, remaining = process_retry_queue(collection)
+                        st.session_state['retry_result'] = f"✅ Stored {stored} chunk(s), {remaining} still queued"
+                    except Exception as e:
+                        st.error(f"❌ Error re-embedding chunks: {e}")
+                    else:
+                        st.rerun()
+        
         # Clear database button
         if st.button('🗑️ Clear Database', key='clear_db', help="Delete all documents from the database"):
             try:
                 reset_collection(client)
+                clear_retry_queue(collection.name)
                 st.success("✅ Database cleared successfully")
                 st.rerun()
             except Exception as e:
@@ -291,42 +325,45 @@ if search_button and query:
                 # Generate embedding for query
                 query_embedding = get_embeddings([query])[0]
                 
-                # Search ChromaDB for more results to get better context
-                num_results = min(10, collection.count())  # Get up to 10 results or all available
-                results = collection.query(
-                    query_embeddings=[query_embedding],
-                    n_results=num_results
-                )
-                
-                # Combine retrieved chunks with better formatting
-                context = "\n\n---\n\n".join(results['documents'][0])
-                
-                # Show how many results were retrieved
-                st.info(f"📚 Retrieved {len(results['documents'][0])} relevant document sections")
-                
-                # Generate response with better prompt
-                answer = generate_response(query, context)
-                
-                # Display results
-                st.markdown("""
-                    <div class="result-container">
-                        <div class="result-title">💡 Answer</div>
-                        <div class="result-text">
-                """, unsafe_allow_html=True)
-                
-                st.markdown(answer)
-                
-                st.markdown("""
+                if query_embedding is None:
+                    st.error('❌ Could not embed your question. Please try again in a moment.')
+                else:
+                    # Search ChromaDB for more results to get better context
+                    num_results = min(10, collection.count())  # Get up to 10 results or all available
+                    results = collection.query(
+                        query_embeddings=[query_embedding],
+                        n_results=num_results
+                    )
+                    
+                    # Combine retrieved chunks with better formatting
+                    context = "\n\n---\n\n".join(results['documents'][0])
+                    
+                    # Show how many results were retrieved
+                    st.info(f"📚 Retrieved {len(results['documents'][0])} relevant document sections")
+                    
+                    # Generate response with better prompt
+                    answer = generate_response(query, context)
+                    
+                    # Display results
+                    st.markdown("""
+                        <div class="result-container">
+                            <div class="result-title">💡 Answer</div>
+                            <div class="result-text">
+                    """, unsafe_allow_html=True)
+                    
+                    st.markdown(answer)
+                    
+                    st.markdown("""
+                            </div>
                         </div>
-                    </div>
-                """, unsafe_allow_html=True)
-                
-                # Show sources with relevance
-                with st.expander(f"📖 View Source Documents ({len(results['documents'][0])} matches)"):
-                    for i, doc in enumerate(results['documents'][0], 1):
-                        st.markdown(f"**Source {i}:**")
-                        st.text_area(f"Content {i}", doc, height=100, disabled=True, key=f"source_{i}")
-                        st.divider()
+                    """, unsafe_allow_html=True)
+                    
+                    # Show sources with relevance
+                    with st.expander(f"📖 View Source Documents ({len(results['documents'][0])} matches)"):
+                        for i, doc in enumerate(results['documents'][0], 1):
+                            st.markdown(f"**Source {i}:**")
+                            st.text_area(f"Content {i}", doc, height=100, disabled=True, key=f"source_{i}")
+                            st.divider()
         
         except Exception as e:
             st.error(f'❌ Error: {e}')
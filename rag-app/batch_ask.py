@@ -0,0 +1,215 @@
+"""
+Batch Question-Answering Module
+
+Runs many questions against a collection in one pass, for evaluation workloads:
+
+PIPELINE:
+- Read questions from a file (one per line, or JSONL with a "question" field)
+- Embed all questions in bulk (get_query_embeddings)
+- Retrieve context with multi-vector collection.query calls
+- Generate answers concurrently, spaced to stay under a requests-per-minute limit
+- Write answers, retrieved chunk IDs and per-question timings as JSONL
+
+USAGE:
+    python batch_ask.py questions.txt -o answers.jsonl --workers 4 --rpm 60
+"""
+
+import argparse
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from embeddings import get_query_embeddings, generate_answer
+from chroma_client import get_chroma_client
+
+
+class RateLimiter:
+    """
+    Space calls evenly so no more than requests_per_minute start per minute.
+    Thread-safe; a value of 0 or None disables limiting.
+    """
+
+    def __init__(self, requests_per_minute=None):
+        self.interval = 60.0 / requests_per_minute if requests_per_minute else 0.0
+        self.next_slot = 0.0
+        self.lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def read_questions(path):
+    """
+    Read questions from a text file (one per line) or a JSONL file.
+
+    Args:
+        path (str): Path to the questions file. Files ending in .jsonl are
+            parsed as JSON objects with a "question" field.
+
+    Returns:
+        list: List of question strings (blank lines are skipped).
+    """
+    questions = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if path.endswith(".jsonl"):
+                questions.append(json.loads(line)["question"])
+            else:
+                questions.append(line)
+    return questions
+
+
+def batch_ask(collection, questions, n_results=10, max_workers=4,
+              requests_per_minute=None, query_batch_size=100):
+    """
+    Answer a list of questions against a collection.
+
+    Embedding and retrieval run in bulk; embed and retrieval timings are the
+    batch time divided evenly across the questions in that batch. Time spent
+    waiting on the requests-per-minute limiter is reported as rate_wait_s,
+    separate from generate_s.
+
+    Args:
+        collection (chromadb.Collection): The collection to search.
+        questions (list): List of question strings.
+        n_results (int): Number of chunks to retrieve per question.
+        max_workers (int): Number of concurrent generation calls.
+        requests_per_minute (int): Optional cap on generation calls per minute,
+            counting retries.
+        query_batch_size (int): Number of query vectors per collection.query call.
+
+    Returns:
+        list: One result dict per question, in input order.
+    """
+    if not questions:
+        return []
+
+    results = [
+        {"question": q, "answer": None, "chunk_ids": [], "error": None, "timings": {}}
+        for q in questions
+    ]
+
+    # Embed all questions in bulk
+    start = time.perf_counter()
+    query_embeddings = get_query_embeddings(questions)
+    embed_share = (time.perf_counter() - start) / len(questions)
+
+    contexts = [None] * len(questions)
+    pending = []
+    for i, emb in enumerate(query_embeddings):
+        results[i]["timings"]["embed_s"] = round(embed_share, 4)
+        if emb is None:
+            results[i]["error"] = "Failed to embed question"
+        else:
+            pending.append(i)
+
+    # Retrieve with multi-vector queries
+    num_results = min(n_results, collection.count())
+    if num_results == 0:
+        for i in pending:
+            results[i]["error"] = "No documents in collection"
+        pending = []
+
+    for b in range(0, len(pending), query_batch_size):
+        indices = pending[b:b + query_batch_size]
+        start = time.perf_counter()
+        try:
+            response = collection.query(
+                query_embeddings=[query_embeddings[i] for i in indices],
+                n_results=num_results
+            )
+        except Exception as e:
+            for i in indices:
+                results[i]["error"] = f"Retrieval failed: {e}"
+            continue
+        retrieve_share = (time.perf_counter() - start) / len(indices)
+
+        for row, i in enumerate(indices):
+            results[i]["chunk_ids"] = response["ids"][row]
+            results[i]["timings"]["retrieve_s"] = round(retrieve_share, 4)
+            contexts[i] = "\n\n---\n\n".join(response["documents"][row])
+
+    # Generate answers concurrently; the limiter gates every attempt, retries included
+    limiter = RateLimiter(requests_per_minute)
+
+    def answer(i):
+        rate_wait = [0.0]
+
+        def wait_for_slot():
+            wait_start = time.perf_counter()
+            limiter.wait()
+            rate_wait[0] += time.perf_counter() - wait_start
+
+        start = time.perf_counter()
+        try:
+            results[i]["answer"] = generate_answer(questions[i], contexts[i], before_attempt=wait_for_slot)
+        except Exception as e:
+            results[i]["error"] = f"Generation failed: {e}"
+        # Keep limiter queueing out of generate_s so it reflects API time only
+        results[i]["timings"]["rate_wait_s"] = round(rate_wait[0], 4)
+        results[i]["timings"]["generate_s"] = round(time.perf_counter() - start - rate_wait[0], 4)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        list(executor.map(answer, [i for i in range(len(questions)) if contexts[i] is not None]))
+
+    for r in results:
+        r["timings"]["total_s"] = round(sum(r["timings"].values()), 4)
+
+    return results
+
+
+def write_results(results, path):
+    """
+    Write batch results to a JSONL file, one object per question.
+
+    Args:
+        results (list): Result dicts from batch_ask.
+        path (str): Output file path.
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        for r in results:
+            f.write(json.dumps(r, ensure_ascii=False) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Answer a file of questions against the document collection.")
+    parser.add_argument("questions", help="Questions file (.txt one per line, or .jsonl with a 'question' field)")
+    parser.add_argument("-o", "--output", default="answers.jsonl", help="Output JSONL path")
+    parser.add_argument("--collection", default="rag_documents", help="Collection name")
+    parser.add_argument("--n-results", type=int, default=10, help="Chunks retrieved per question")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent generation calls")
+    parser.add_argument("--rpm", type=int, default=None, help="Max generation requests per minute, retries included")
+    args = parser.parse_args()
+
+    questions = read_questions(args.questions)
+    # Fail loudly on a missing collection instead of creating an empty one
+    collection = get_chroma_client().get_collection(name=args.collection)
+
+    start = time.perf_counter()
+    results = batch_ask(
+        collection,
+        questions,
+        n_results=args.n_results,
+        max_workers=args.workers,
+        requests_per_minute=args.rpm
+    )
+    write_results(results, args.output)
+
+    failed = sum(1 for r in results if r["error"])
+    print(f"Answered {len(results) - failed}/{len(results)} questions in "
+          f"{time.perf_counter() - start:.1f}s -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
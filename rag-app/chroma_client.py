@@ -7,6 +7,7 @@ import chromadb
 from chromadb.config import Settings
 import uuid
 from datetime import datetime
+from retry_queue import enqueue_chunks
 
 
 def get_chroma_client():
@@ -47,6 +48,18 @@ def get_chroma_client():
     )
     return client
 
+def get_local_client(path="./chroma_data"):
+    """
+    Open a local persistent ChromaDB client (no cloud credentials needed).
+
+    Args:
+        path (str): Directory for the local database.
+
+    Returns:
+        chromadb.Client: ChromaDB client instance.
+    """
+    return chromadb.PersistentClient(path=path)
+
 def get_or_create_collection(client, collection_name="rag_documents"):
     """
     Get or create a ChromaDB collection.
@@ -80,20 +93,24 @@ def store_chunks_and_embeddings(collection, text_chunks, embeddings, file_name="
     """
     Store text chunks and their embeddings in the ChromaDB collection.
 
+    Chunks whose embedding is None (embedding failed) are not stored; they are
+    put on the persistent retry queue and filled in by process_retry_queue.
+
     Args:
         collection (chromadb.Collection): The ChromaDB collection.
         text_chunks (list): List of text chunks.
-        embeddings (list): List of embedding vectors corresponding to the chunks.
+        embeddings (list): List of embedding vectors corresponding to the chunks (None for failed chunks).
         file_name (str): Optional file name for metadata.
     """
     if len(text_chunks) != len(embeddings):
         raise ValueError("Number of text chunks must match number of embeddings")
 
     # Validate embedding dimensions are consistent
-    if embeddings:
-        first_dim = len(embeddings[0])
+    valid_embeddings = [emb for emb in embeddings if emb is not None]
+    if valid_embeddings:
+        first_dim = len(valid_embeddings[0])
         for i, emb in enumerate(embeddings):
-            if len(emb) != first_dim:
+            if emb is not None and len(emb) != first_dim:
                 raise ValueError(f"Inconsistent embedding dimensions: embedding {i} has {len(emb)} dimensions, expected {first_dim}")
     
     # Generate unique IDs for the chunks using UUID
@@ -111,15 +128,28 @@ def store_chunks_and_embeddings(collection, text_chunks, embeddings, file_name="
         for i in range(len(text_chunks))
     ]
 
+    stored = [i for i, emb in enumerate(embeddings) if emb is not None]
+    failed = [i for i, emb in enumerate(embeddings) if emb is None]
+
     # Add to collection
-    collection.add(
-        documents=text_chunks,
-        embeddings=embeddings,
-        ids=ids,
-        metadatas=metadatas
-    )
+    if stored:
+        collection.add(
+            documents=[text_chunks[i] for i in stored],
+            embeddings=[embeddings[i] for i in stored],
+            ids=[ids[i] for i in stored],
+            metadatas=[metadatas[i] for i in stored]
+        )
+
+    # Queue failed chunks for re-embedding instead of storing placeholder vectors
+    if failed:
+        enqueue_chunks(
+            collection.name,
+            [ids[i] for i in failed],
+            [text_chunks[i] for i in failed],
+            [metadatas[i] for i in failed]
+        )
     
-    print(f"Stored {len(text_chunks)} chunks in collection")
+    print(f"Stored {len(stored)} chunks in collection")
 
 def reset_collection(client, collection_name="rag_documents"):
     """
@@ -0,0 +1,110 @@
+"""
+Adaptive Concurrency Module
+
+Keeps Gemini API calls under the service's rate limits without a fixed cap:
+
+AIMD CONTROLLER:
+- Additive increase: each successful call grows the limit by 1/limit
+  (roughly +1 slot per limit's worth of successes)
+- Multiplicative decrease: each 429/503 halves the limit
+- Callers block in acquire() while the in-flight count is at the limit
+
+RETRIES:
+- Overload errors (429 / RESOURCE_EXHAUSTED / 503 / UNAVAILABLE) are retried
+- Full-jitter exponential backoff spreads retries out across threads
+- Any other error is raised immediately
+"""
+
+import random
+import threading
+import time
+
+
+def is_overload_error(error):
+    """
+    Check whether an API error means the service is rate limiting or overloaded.
+
+    Args:
+        error (Exception): The exception raised by the API call.
+
+    Returns:
+        bool: True for 429/503-style errors.
+    """
+    error_msg = str(error)
+    return any(code in error_msg for code in ("429", "RESOURCE_EXHAUSTED", "503", "UNAVAILABLE"))
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD concurrency limit shared by every thread calling the same API.
+    """
+
+    def __init__(self, initial=4, minimum=1, maximum=16, decrease_factor=0.5):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.decrease_factor = decrease_factor
+        self.in_flight = 0
+        self.cond = threading.Condition()
+
+    def acquire(self):
+        """Block until a slot is free under the current limit, then take it."""
+        with self.cond:
+            while self.in_flight >= int(self.limit):
+                self.cond.wait()
+            self.in_flight += 1
+
+    def release(self, overloaded=None):
+        """
+        Free a slot and adjust the limit.
+
+        Args:
+            overloaded (bool): True shrinks the limit, False grows it,
+                None (a non-overload error) leaves it unchanged.
+        """
+        with self.cond:
+            self.in_flight -= 1
+            if overloaded:
+                self.limit = max(self.minimum, self.limit * self.decrease_factor)
+            elif overloaded is False:
+                self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+            self.cond.notify_all()
+
+
+def call_with_retries(fn, controller, max_retries=5, base_delay=1.0, max_delay=30.0,
+                      before_attempt=None):
+    """
+    Call fn under the controller, retrying overload errors with jittered backoff.
+
+    Args:
+        fn (callable): Zero-argument function making the API call.
+        controller (AdaptiveConcurrency): Shared concurrency controller.
+        max_retries (int): Maximum number of attempts.
+        base_delay (float): Backoff ceiling for the first retry, in seconds.
+        max_delay (float): Upper bound on any single backoff, in seconds.
+        before_attempt (callable): Optional hook run before every attempt,
+            including retries (e.g. a rate limiter's wait).
+
+    Returns:
+        The return value of fn.
+
+    Raises:
+        Exception: The last error if it is not an overload or attempts run out.
+    """
+    for attempt in range(max_retries):
+        if before_attempt is not None:
+            before_attempt()
+        controller.acquire()
+        try:
+            result = fn()
+        except Exception as e:
+            overloaded = is_overload_error(e)
+            controller.release(overloaded=True if overloaded else None)
+            if not overloaded or attempt == max_retries - 1:
+                raise
+            wait_time = random.uniform(0, min(max_delay, base_delay * 2 ** attempt))
+            print(f"API overloaded (attempt {attempt + 1}/{max_retries}). Retrying in {wait_time:.1f}s...")
+            time.sleep(wait_time)
+            continue
+        controller.release(overloaded=False)
+        return result
@@ -1,10 +1,171 @@
 from pypdf import PdfReader
 from docx import Document
+import hashlib
 import io
+import json
+import os
+import threading
+
+# Bump when extraction logic changes so stale cache entries are ignored
+EXTRACTOR_VERSION = 1
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".parse_cache")
+
+
+class ParseCache:
+    """
+    On-disk cache of extracted page text, keyed by SHA-256 of the file bytes,
+    the file type and EXTRACTOR_VERSION. Entries are evicted least recently
+    used first once the cache grows past max_bytes.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=200 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+        self.lock = threading.Lock()
+
+    def _path(self, data, file_type):
+        digest = hashlib.sha256(data).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.{file_type}.v{EXTRACTOR_VERSION}.json")
+
+    def get(self, data, file_type):
+        """
+        Look up the cached pages for a file.
+
+        Args:
+            data (bytes): Raw file bytes.
+            file_type (str): File extension ('pdf', 'docx').
+
+        Returns:
+            list: Cached page texts, or None on a miss.
+        """
+        path = self._path(data, file_type)
+        try:
+            with open(path, encoding="utf-8") as f:
+                pages = json.load(f)["pages"]
+            os.utime(path)  # Mark as recently used for eviction
+        except (OSError, ValueError, KeyError):
+            with self.lock:
+                self.stats["misses"] += 1
+            return None
+        with self.lock:
+            self.stats["hits"] += 1
+        return pages
+
+    def put(self, data, file_type, pages):
+        """
+        Store extracted pages for a file and evict old entries if over budget.
+        Write errors are logged and ignored.
+
+        Args:
+            data (bytes): Raw file bytes.
+            file_type (str): File extension ('pdf', 'docx').
+            pages (list): Extracted page texts.
+        """
+        path = self._path(data, file_type)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"pages": pages}, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+            self._evict()
+        except OSError as e:
+            # Caching is best-effort; a read-only or full disk must not fail the upload
+            print(f"Could not write parse cache entry: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def _evict(self):
+        with self.lock:
+            entries = []
+            for name in os.listdir(self.cache_dir):
+                if not name.endswith(".json"):
+                    continue
+                entry_path = os.path.join(self.cache_dir, name)
+                try:
+                    st = os.stat(entry_path)
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, entry_path))
+
+            total = sum(size for _, size, _ in entries)
+            for _, size, entry_path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(entry_path)
+                except OSError:
+                    continue
+                total -= size
+                self.stats["evictions"] += 1
+
+    def get_stats(self):
+        """
+        Return hit/miss/eviction counters and the hit rate.
+
+        Returns:
+            dict: Cache statistics.
+        """
+        with self.lock:
+            stats = dict(self.stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+
+# Shared cache used by extract_text_from_files
+parse_cache = ParseCache()
+
+
+def extract_pages(uploaded_file, cache=parse_cache):
+    """
+    Extract page texts from one uploaded file, using the parse cache for PDF/DOCX.
+
+    Args:
+        uploaded_file: Streamlit UploadedFile object.
+        cache (ParseCache): Parse cache, or None to always parse.
+
+    Returns:
+        list: Page texts (PDF pages; a single page for TXT and DOCX), or
+            None for unsupported file types.
+    """
+    file_type = uploaded_file.name.split('.')[-1].lower()
+    data = uploaded_file.read()
+
+    if file_type == 'txt':
+        # Decoding is cheaper than hashing, so TXT is never cached
+        return [data.decode('utf-8')]
+
+    if file_type not in ('pdf', 'docx'):
+        return None
+
+    if cache is not None:
+        pages = cache.get(data, file_type)
+        if pages is not None:
+            return pages
+
+    if file_type == 'pdf':
+        # Read PDF
+        pdf_reader = PdfReader(io.BytesIO(data))
+        pages = [page.extract_text() for page in pdf_reader.pages]
+    else:
+        # Read DOCX
+        doc = Document(io.BytesIO(data))
+        pages = ["\n".join(para.text for para in doc.paragraphs)]
+
+    if cache is not None:
+        cache.put(data, file_type, pages)
+    return pages
+
 
 def extract_text_from_files(uploaded_files):
     """
     Extract text content from uploaded PDF, TXT, and DOCX files.
+    Repeat uploads of the same PDF/DOCX are served from the parse cache.
 
     Args:
         uploaded_files (list): List of Streamlit UploadedFile objects.
@@ -15,28 +176,15 @@ def extract_text_from_files(uploaded_files):
     combined_text = ""
 
     for uploaded_file in uploaded_files:
-        file_type = uploaded_file.name.split('.')[-1].lower()
+        pages = extract_pages(uploaded_file)
 
-        if file_type == 'pdf':
-            # Read PDF
-            pdf_reader = PdfReader(io.BytesIO(uploaded_file.read()))
-            for page in pdf_reader.pages:
-                combined_text += page.extract_text() + "\n"
-
-        elif file_type == 'txt':
-            # Read TXT
-            combined_text += uploaded_file.read().decode('utf-8') + "\n"
-
-        elif file_type == 'docx':
-            # Read DOCX
-            doc = Document(io.BytesIO(uploaded_file.read()))
-            for para in doc.paragraphs:
-                combined_text += para.text + "\n"
-
-        else:
+        if pages is None:
             # Skip unsupported files
             continue
 
+        for page in pages:
+            combined_text += page + "\n"
+
     return combined_text.strip()
 
 def chunk_text(text, chunk_size=500, overlap=50):
@@ -8,6 +8,7 @@ EMBEDDINGS:
 - Output: 768-dimensional vectors
 - Converts text to numerical representation
 - Validates dimension consistency across all embeddings
+- Failed chunks return None (queued for re-embedding, never zero vectors)
 
 RESPONSE GENERATION:
 - Model: gemini-2.5-flash
@@ -17,16 +18,18 @@ RESPONSE GENERATION:
 
 KEY FEATURES:
 - Response caching (saves API quota)
-- Exponential backoff for API overload
+- Adaptive (AIMD) concurrency shared by all Gemini calls
+- Jittered exponential backoff on 429/503 errors
 - Quota limit detection (429 errors)
 - Dimension consistency validation
 """
 
 import google.genai as genai
 import os
-import time
 from dotenv import load_dotenv
 import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from concurrency import AdaptiveConcurrency, call_with_retries
 
 # Load environment variables
 load_dotenv()
@@ -34,6 +37,9 @@ load_dotenv()
 # Create client for API interaction
 client = genai.Client(api_key=os.getenv("GOOGLE_API_KEY"))
 
+# Shared AIMD concurrency limit for all Gemini calls
+gemini_concurrency = AdaptiveConcurrency()
+
 # Response cache: MD5(query + context) -> response
 response_cache = {}
 
@@ -41,71 +47,69 @@ def get_embeddings(text_chunks):
     """
     Generate embeddings for text chunks using Google Generative AI gemini-embedding-001.
 
+    Chunks are embedded in parallel, with the shared adaptive concurrency
+    controller limiting calls in flight; 429/503 errors are retried. A chunk
+    that still fails gets None instead of a placeholder vector, so callers can
+    queue it for re-embedding rather than storing junk.
+
     Args:
         text_chunks (list): List of text strings to embed.
 
     Returns:
-        list: List of embedding vectors (lists of floats).
+        list: List of embedding vectors (lists of floats), None for failed chunks.
     """
     if not text_chunks:
         return []
 
-    embeddings = []
-    embedding_dimension = None
-    
-    for i, chunk in enumerate(text_chunks):
+    def embed_chunk(i):
         try:
-            response = client.models.embed_content(
-                model="models/gemini-embedding-001",
-                contents=[chunk]
+            response = call_with_retries(
+                lambda: client.models.embed_content(
+                    model="models/gemini-embedding-001",
+                    contents=[text_chunks[i]]
+                ),
+                gemini_concurrency
             )
-            embedding = response.embeddings[0].values
-            
-            # Store the first embedding dimension as reference
-            if embedding_dimension is None:
-                embedding_dimension = len(embedding)
-            
-            embeddings.append(list(embedding))
+            return list(response.embeddings[0].values)
         except Exception as e:
             print(f"Error generating embedding for chunk {i}: {e}")
-            # If we have a reference dimension, use it. Otherwise, skip this chunk
-            if embedding_dimension is not None:
-                embeddings.append([0.0] * embedding_dimension)
-            else:
-                # Try one more time with fallback
-                embeddings.append([0.0] * 768)
+            return None
+
+    # Fan chunks out; gemini_concurrency decides how many calls are in flight
+    with ThreadPoolExecutor(max_workers=gemini_concurrency.maximum) as executor:
+        embeddings = list(executor.map(embed_chunk, range(len(text_chunks))))
+
+    # Use the first successful embedding's dimension as reference
+    embedding_dimension = next((len(emb) for emb in embeddings if emb is not None), None)
+    for i, emb in enumerate(embeddings):
+        if emb is not None and len(emb) != embedding_dimension:
+            print(f"Error generating embedding for chunk {i}: got {len(emb)} dimensions, expected {embedding_dimension}")
+            embeddings[i] = None
     
-    # If we still don't have a dimension, standardize to 768
+    failed = sum(1 for emb in embeddings if emb is None)
     if embedding_dimension is None:
-        embedding_dimension = 768
-        embeddings = [[0.0] * 768 for _ in embeddings]
-    
-    # Ensure all embeddings have the same dimension
-    standardized_embeddings = []
-    for emb in embeddings:
-        if len(emb) != embedding_dimension:
-            # Pad or trim to match the standard dimension
-            if len(emb) < embedding_dimension:
-                emb = list(emb) + [0.0] * (embedding_dimension - len(emb))
-            else:
-                emb = emb[:embedding_dimension]
-        standardized_embeddings.append(emb)
-    
-    print(f"Generated {len(standardized_embeddings)} embeddings with dimension {embedding_dimension}")
-    return standardized_embeddings
+        print(f"Failed to generate all {failed} embeddings")
+    else:
+        print(f"Generated {len(embeddings) - failed} embeddings with dimension {embedding_dimension} ({failed} failed)")
+    return embeddings
 
-def generate_response(query, context, max_retries=3):
+def generate_answer(query, context, max_retries=3, before_attempt=None):
     """
-    Generate a response using Google Generative AI based on the query and context.
-    Includes retry logic, caching, and quota handling.
+    Generate an answer with Google Generative AI, raising on failure.
+    Includes retry logic (429/503, jittered backoff) and caching.
 
     Args:
         query (str): The user's question.
         context (str): The retrieved context chunks combined.
         max_retries (int): Maximum number of retry attempts.
+        before_attempt (callable): Optional hook run before every attempt,
+            including retries (e.g. a rate limiter's wait).
 
     Returns:
-        str: The generated response.
+        str: The generated answer.
+
+    Raises:
+        Exception: The API error once retries are exhausted.
     """
     # Create cache key from query and context
     cache_key = hashlib.md5(f"{query}_{context[:500]}".encode()).hexdigest()
@@ -131,23 +135,44 @@ QUESTION: {query}
 
 DETAILED ANSWER:"""
 
-    for attempt in range(max_retries):
-        try:
-            response = client.models.generate_content(
-                model="gemini-2.5-flash",
-                contents=prompt
-            )
-            result = response.text
-            # Cache the successful response
-            response_cache[cache_key] = result
-            return result
-            
-        except Exception as e:
-            error_msg = str(e)
-            
-            # Check if it's a quota/rate limit error (429 or 503)
-            if "429" in error_msg or "RESOURCE_EXHAUSTED" in error_msg:
-                return """⚠️ **API Quota Limit Reached**
+    response = call_with_retries(
+        lambda: client.models.generate_content(
+            model="gemini-2.5-flash",
+            contents=prompt
+        ),
+        gemini_concurrency,
+        max_retries=max_retries,
+        before_attempt=before_attempt
+    )
+    result = response.text
+    # Cache the successful response
+    response_cache[cache_key] = result
+    return result
+
+
+def generate_response(query, context, max_retries=3):
+    """
+    Generate a response using Google Generative AI based on the query and context.
+    Includes retry logic (429/503, jittered backoff), caching, and quota handling.
+    Errors are returned as user-facing messages instead of raised.
+
+    Args:
+        query (str): The user's question.
+        context (str): The retrieved context chunks combined.
+        max_retries (int): Maximum number of retry attempts.
+
+    Returns:
+        str: The generated response.
+    """
+    try:
+        return generate_answer(query, context, max_retries=max_retries)
+        
+    except Exception as e:
+        error_msg = str(e)
+        
+        # Retries are exhausted by now; report quota/overload errors (429 or 503)
+        if "429" in error_msg or "RESOURCE_EXHAUSTED" in error_msg:
+            return """⚠️ **API Quota Limit Reached**
 
 You've exceeded the free tier quota for the Gemini API (20 requests per day).
 
@@ -157,16 +182,45 @@ You've exceeded the free tier quota for the Gemini API (20 requests per day).
 3. **Check your usage** at https://ai.dev/rate-limit
 
 The free tier is limited to 20 generation requests per day. For production use, please consider upgrading to a paid plan for higher limits."""
-            
-            elif "503" in error_msg or "UNAVAILABLE" in error_msg:
-                if attempt < max_retries - 1:
-                    wait_time = 2 ** attempt  # Exponential backoff: 1s, 2s, 4s
-                    print(f"API overloaded (attempt {attempt + 1}/{max_retries}). Retrying in {wait_time}s...")
-                    time.sleep(wait_time)
-                    continue
-                else:
-                    return "⚠️ The AI service is currently overloaded. Please try again in a moment."
-            else:
-                return f"❌ Error generating response: {e}"
-    
-    return "❌ Error generating response: Maximum retries exceeded."
\ No newline at end of file
+        
+        elif "503" in error_msg or "UNAVAILABLE" in error_msg:
+            return "⚠️ The AI service is currently overloaded. Please try again in a moment."
+        else:
+            return f"❌ Error generating response: {e}"
+
+
+def get_query_embeddings(queries, batch_size=100):
+    """
+    Embed many queries in bulk, sending up to batch_size texts per API call.
+    If a batch call fails, its queries are embedded one at a time instead.
+
+    Args:
+        queries (list): List of query strings to embed.
+        batch_size (int): Maximum number of texts per embed_content request.
+
+    Returns:
+        list: One embedding vector per query, or None where that query failed.
+    """
+    if not queries:
+        return []
+
+    embeddings = []
+    for start in range(0, len(queries), batch_size):
+        batch = queries[start:start + batch_size]
+        try:
+            response = call_with_retries(
+                lambda: client.models.embed_content(
+                    model="models/gemini-embedding-001",
+                    contents=batch
+                ),
+                gemini_concurrency
+            )
+            if len(response.embeddings) != len(batch):
+                raise ValueError(f"Got {len(response.embeddings)} embeddings for {len(batch)} queries")
+            embeddings.extend(list(e.values) for e in response.embeddings)
+        except Exception as e:
+            # One bad query must not fail the whole batch; embed each one separately
+            print(f"Error embedding queries {start}-{start + len(batch) - 1}: {e}. Retrying individually...")
+            embeddings.extend(get_embeddings(batch))
+
+    return embeddings
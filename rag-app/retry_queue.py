@@ -0,0 +1,161 @@
+"""
+Re-embed Queue Module
+
+Chunks whose embedding failed are kept here instead of being stored with a
+placeholder vector:
+
+STORAGE:
+- Append-only JSONL file (retry_queue.jsonl next to this module by default)
+- One entry per chunk: collection name, chunk ID, text, metadata
+- Survives app restarts, so failed chunks are never lost
+
+PROCESSING:
+- process_retry_queue re-embeds the pending chunks for a collection
+- Chunks that embed successfully are added with their original IDs/metadata
+- Chunks that fail again stay queued for the next run
+"""
+
+import json
+import os
+import threading
+
+DEFAULT_QUEUE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "retry_queue.jsonl")
+
+_lock = threading.Lock()
+# Held for a whole process_retry_queue run so two runs never store the same chunks
+_process_lock = threading.Lock()
+
+
+def _read_entries(path):
+    if not os.path.exists(path):
+        return []
+    entries = []
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+                if not all(key in entry for key in ("collection", "id", "document", "metadata")):
+                    raise ValueError("missing fields")
+            except (ValueError, TypeError) as e:
+                # A torn or corrupt line must not break the whole queue
+                print(f"Skipping corrupt retry queue line {line_number} in {path}: {e}")
+                continue
+            entries.append(entry)
+    return entries
+
+
+def _write_entries(entries, path):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        for entry in entries:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    os.replace(tmp_path, path)
+
+
+def enqueue_chunks(collection_name, ids, documents, metadatas, path=DEFAULT_QUEUE_PATH):
+    """
+    Add chunks that could not be embedded to the persistent retry queue.
+
+    Args:
+        collection_name (str): Collection the chunks belong to.
+        ids (list): Chunk IDs.
+        documents (list): Chunk texts.
+        metadatas (list): Chunk metadata dicts.
+        path (str): Queue file path.
+    """
+    with _lock:
+        with open(path, "a", encoding="utf-8") as f:
+            for chunk_id, document, metadata in zip(ids, documents, metadatas):
+                entry = {
+                    "collection": collection_name,
+                    "id": chunk_id,
+                    "document": document,
+                    "metadata": metadata
+                }
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    print(f"Queued {len(ids)} chunks for re-embedding")
+
+
+def pending_count(collection_name, path=DEFAULT_QUEUE_PATH):
+    """
+    Count queued chunks for a collection.
+
+    Args:
+        collection_name (str): Collection name.
+        path (str): Queue file path.
+
+    Returns:
+        int: Number of chunks waiting to be re-embedded.
+    """
+    with _lock:
+        return sum(1 for e in _read_entries(path) if e["collection"] == collection_name)
+
+
+def clear_retry_queue(collection_name, path=DEFAULT_QUEUE_PATH):
+    """
+    Drop all queued chunks for a collection (e.g. after the collection is cleared).
+
+    Args:
+        collection_name (str): Collection name.
+        path (str): Queue file path.
+    """
+    with _lock:
+        entries = _read_entries(path)
+        _write_entries([e for e in entries if e["collection"] != collection_name], path)
+
+
+def process_retry_queue(collection, path=DEFAULT_QUEUE_PATH):
+    """
+    Re-embed queued chunks for a collection and add the ones that succeed.
+
+    Args:
+        collection (chromadb.Collection): The collection to fill in.
+        path (str): Queue file path.
+
+    Returns:
+        tuple: (number of chunks stored, number still queued).
+    """
+    # Imported here so chroma_client (which imports this module) does not
+    # need Gemini configured just to load
+    from embeddings import get_embeddings
+
+    if not _process_lock.acquire(blocking=False):
+        print("Retry queue is already being processed")
+        return 0, pending_count(collection.name, path)
+    try:
+        return _process_pending(collection, path, get_embeddings)
+    finally:
+        _process_lock.release()
+
+
+def _process_pending(collection, path, get_embeddings):
+    with _lock:
+        pending = [e for e in _read_entries(path) if e["collection"] == collection.name]
+    if not pending:
+        return 0, 0
+
+    # Embed and store without holding the lock, so renders and ingestion aren't blocked
+    embeddings = get_embeddings([e["document"] for e in pending])
+    done = [(e, emb) for e, emb in zip(pending, embeddings) if emb is not None]
+
+    if done:
+        collection.add(
+            documents=[e["document"] for e, _ in done],
+            embeddings=[emb for _, emb in done],
+            ids=[e["id"] for e, _ in done],
+            metadatas=[e["metadata"] for e, _ in done]
+        )
+
+    # Re-read so entries enqueued meanwhile are kept; drop only what was stored
+    done_ids = {e["id"] for e, _ in done}
+    with _lock:
+        remaining = [
+            e for e in _read_entries(path)
+            if not (e["collection"] == collection.name and e["id"] in done_ids)
+        ]
+        _write_entries(remaining, path)
+
+    print(f"Re-embedded {len(done)} queued chunks, {len(pending) - len(done)} still pending")
+    return len(done), len(pending) - len(done)
@@ -0,0 +1,206 @@
+"""
+Collection Snapshot Module
+
+Exports a collection to disk and loads it back without re-embedding anything:
+
+SNAPSHOT LAYOUT (one directory):
+- manifest.json:   collection name, row count, dimension, dtype, format version
+- embeddings.npy:  contiguous float32 matrix (count x dimension)
+- records.json:    columnar ids / documents / metadatas arrays, same row order
+
+FEATURES:
+- Export pages through the collection and writes straight into a memory-mapped .npy
+- load_snapshot memory-maps embeddings.npy, so opening a snapshot is near-instant
+- Import bulk-loads in large batches (the client's max batch size by default)
+- Works with any client: cloud -> local, local -> cloud, or a warm restore
+
+USAGE:
+    python snapshot.py export snapshots/rag_documents
+    python snapshot.py import snapshots/rag_documents --local ./chroma_data
+"""
+
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+from chroma_client import get_chroma_client, get_local_client, get_or_create_collection, reset_collection
+from retry_queue import clear_retry_queue
+
+FORMAT_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+EMBEDDINGS_FILE = "embeddings.npy"
+RECORDS_FILE = "records.json"
+
+
+def export_snapshot(collection, snapshot_dir, page_size=1000):
+    """
+    Write a collection's embeddings, documents and metadata to a snapshot directory.
+
+    Args:
+        collection (chromadb.Collection): The collection to export.
+        snapshot_dir (str): Output directory (created if missing).
+        page_size (int): Number of rows fetched per collection.get call.
+
+    Returns:
+        dict: The snapshot manifest.
+    """
+    os.makedirs(snapshot_dir, exist_ok=True)
+    count = collection.count()
+
+    ids, documents, metadatas = [], [], []
+    matrix = None
+    dimension = 0
+
+    for offset in range(0, count, page_size):
+        page = collection.get(
+            include=["embeddings", "documents", "metadatas"],
+            limit=page_size,
+            offset=offset
+        )
+        if not page["ids"]:
+            break
+        page_embeddings = np.asarray(page["embeddings"], dtype=np.float32)
+
+        # Allocate the full on-disk matrix once the dimension is known
+        if matrix is None:
+            dimension = page_embeddings.shape[1]
+            matrix = np.lib.format.open_memmap(
+                os.path.join(snapshot_dir, EMBEDDINGS_FILE),
+                mode="w+",
+                dtype=np.float32,
+                shape=(count, dimension)
+            )
+
+        matrix[offset:offset + len(page_embeddings)] = page_embeddings
+        ids.extend(page["ids"])
+        documents.extend(page["documents"])
+        metadatas.extend(page["metadatas"])
+
+    if matrix is None:
+        np.save(os.path.join(snapshot_dir, EMBEDDINGS_FILE), np.zeros((0, 0), dtype=np.float32))
+    else:
+        matrix.flush()
+        del matrix
+
+    if len(ids) != count:
+        raise ValueError(f"Collection changed during export: expected {count} rows, read {len(ids)}")
+
+    with open(os.path.join(snapshot_dir, RECORDS_FILE), "w", encoding="utf-8") as f:
+        json.dump({"ids": ids, "documents": documents, "metadatas": metadatas}, f, ensure_ascii=False)
+
+    manifest = {
+        "format_version": FORMAT_VERSION,
+        "collection": collection.name,
+        "count": count,
+        "dimension": dimension,
+        "dtype": "float32"
+    }
+    with open(os.path.join(snapshot_dir, MANIFEST_FILE), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+    print(f"Exported {count} rows from '{collection.name}' to {snapshot_dir}")
+    return manifest
+
+
+def load_snapshot(snapshot_dir, mmap=True):
+    """
+    Open a snapshot directory.
+
+    Args:
+        snapshot_dir (str): Snapshot directory written by export_snapshot.
+        mmap (bool): Memory-map embeddings.npy instead of reading it into RAM.
+
+    Returns:
+        tuple: (manifest dict, embeddings array, records dict with ids/documents/metadatas).
+    """
+    with open(os.path.join(snapshot_dir, MANIFEST_FILE), encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    if manifest.get("format_version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported snapshot format version: {manifest.get('format_version')}")
+
+    embeddings = np.load(
+        os.path.join(snapshot_dir, EMBEDDINGS_FILE),
+        mmap_mode="r" if mmap else None
+    )
+
+    with open(os.path.join(snapshot_dir, RECORDS_FILE), encoding="utf-8") as f:
+        records = json.load(f)
+
+    if len(records["ids"]) != manifest["count"] or embeddings.shape[0] != manifest["count"]:
+        raise ValueError("Snapshot is inconsistent: row counts do not match the manifest")
+
+    return manifest, embeddings, records
+
+
+def import_snapshot(client, snapshot_dir, collection_name=None, batch_size=None, replace=False):
+    """
+    Bulk-load a snapshot into a collection.
+
+    Args:
+        client (chromadb.Client): ChromaDB client to load into (cloud or local).
+        snapshot_dir (str): Snapshot directory written by export_snapshot.
+        collection_name (str): Target collection. Defaults to the exported name.
+        batch_size (int): Rows per collection.add call. Defaults to the
+            client's maximum batch size.
+        replace (bool): Reset the target collection (and its retry queue) before loading.
+
+    Returns:
+        chromadb.Collection: The loaded collection.
+    """
+    manifest, embeddings, records = load_snapshot(snapshot_dir)
+    collection_name = collection_name or manifest["collection"]
+
+    if replace:
+        collection = reset_collection(client, collection_name)
+        # Queued chunks belong to the old corpus; don't re-embed them into the restore
+        clear_retry_queue(collection_name)
+    else:
+        collection = get_or_create_collection(client, collection_name)
+
+    if batch_size is None:
+        try:
+            batch_size = client.get_max_batch_size()
+        except Exception:
+            batch_size = 5000
+
+    count = manifest["count"]
+    for start in range(0, count, batch_size):
+        end = min(start + batch_size, count)
+        collection.add(
+            ids=records["ids"][start:end],
+            embeddings=np.ascontiguousarray(embeddings[start:end]),
+            documents=records["documents"][start:end],
+            metadatas=records["metadatas"][start:end]
+        )
+
+    print(f"Imported {count} rows into '{collection_name}' from {snapshot_dir}")
+    return collection
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export or import a collection snapshot.")
+    parser.add_argument("action", choices=["export", "import"], help="Export a collection or import a snapshot")
+    parser.add_argument("snapshot_dir", help="Snapshot directory")
+    parser.add_argument("--collection", default=None, help="Collection name (export default: rag_documents; import default: name in snapshot)")
+    parser.add_argument("--local", default=None, metavar="PATH", help="Use a local persistent ChromaDB at PATH instead of ChromaDB Cloud")
+    parser.add_argument("--replace", action="store_true", help="Reset the target collection before importing")
+    args = parser.parse_args()
+
+    client = get_local_client(args.local) if args.local else get_chroma_client()
+
+    start = time.perf_counter()
+    if args.action == "export":
+        # Export is read-only: never create (or delete and recreate) the source collection
+        collection = client.get_collection(name=args.collection or "rag_documents")
+        export_snapshot(collection, args.snapshot_dir)
+    else:
+        import_snapshot(client, args.snapshot_dir, args.collection, replace=args.replace)
+    print(f"Done in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()